@@ -11,7 +11,8 @@ if getattr(sys, 'frozen', False):
     BASE_DIR = Path(sys._MEIPASS)
     RUNTIME_DIR = Path(os.path.dirname(sys.executable))
     DATA_DIR = Path(os.environ.get("TYK_DB_PATH", RUNTIME_DIR / "tyk_data"))
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    if not DATA_DIR.exists():
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
 else:
     BASE_DIR = Path(__file__).resolve().parent.parent  # project root
     RUNTIME_DIR = BASE_DIR
@@ -23,14 +24,19 @@ PROJECT_ROOT = RUNTIME_DIR
 def _load_or_create_secret_key():
     key_file = DATA_DIR / '.secret_key'
     try:
-        return key_file.read_text().strip()
+        key = key_file.read_text().strip()
     except FileNotFoundError:
+        key = ''
+    if not key:
+        # Missing or empty: generate a key readable only by its owner
         key = 'tyk-notebook-dev-key-' + os.urandom(32).hex()
-        key_file.write_text(key)
-        return key
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(key)
+    return key
 
 
-SECRET_KEY = _load_or_create_secret_key()
+SECRET_KEY = os.environ.get('TYK_SECRET_KEY') or _load_or_create_secret_key()
 
 DEBUG = True
 
@@ -0,0 +1,27 @@
+"""
+Django settings for running the TyK Notebook test suite.
+Extends the development settings with overrides that keep tests fast.
+"""
+from .settings import *  # noqa: F401,F403
+
+# PBKDF2 is deliberately slow; tests never need strong password hashes.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# force_login() in tests then writes a signed cookie, not a django_session row.
+SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+
+# Keep the test database entirely in memory, whatever the dev DB path is.
+# Test classes use django.test.TestCase, which already rolls every test back,
+# so requests are not wrapped in an extra transaction of their own.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'ATOMIC_REQUESTS': False,
+        'TEST': {'NAME': ':memory:'},
+    }
+}
+
+# Build the test schema straight from the models instead of replaying the
+# migration graph. Run with --settings=config.settings to test migrations.
+MIGRATION_MODULES = {app.rsplit('.', 1)[-1]: None for app in INSTALLED_APPS}  # noqa: F405
@@ -1,6 +1,10 @@
 #!/bin/bash
 # TyK Notebook Test Runner
 # Usage: ./run_tests.sh [test_module]
+#
+# Tests run serially by default. Set TYK_TEST_PARALLEL=auto (or a worker
+# count) to spread test classes across CPU cores; parallel runs need tblib
+# installed to report failing tests instead of aborting.
 
 set -e
 
@@ -18,10 +22,10 @@ echo ""
 # Check if specific test module provided
 if [ -z "$1" ]; then
     echo "Running ALL tests..."
-    python -c "import os; os.environ['DJANGO_SETTINGS_MODULE']='tyk_notebook_app.settings'; import django; django.setup(); from django.core.management import call_command; call_command('test', 'tyk_notebook_app.tests', verbosity=2)"
+    python manage.py test tyk_notebook_app.tests --settings=config.test_settings --parallel "${TYK_TEST_PARALLEL:-1}" --verbosity=2
 else
     echo "Running tests for: $1"
-    python -c "import os; os.environ['DJANGO_SETTINGS_MODULE']='tyk_notebook_app.settings'; import django; django.setup(); from django.core.management import call_command; call_command('test', 'tyk_notebook_app.tests.$1', verbosity=2)"
+    python manage.py test "tyk_notebook_app.tests.$1" --settings=config.test_settings --parallel "${TYK_TEST_PARALLEL:-1}" --verbosity=2
 fi
 
 echo ""
@@ -126,6 +126,10 @@ def main():
     create_admin_user()
     import_notebooks()
 
+    # Import heavy notebook libraries while the server starts
+    from tyk_notebook_app.executor import preload_modules_in_background
+    preload_modules_in_background()
+
     # Start browser thread
     if not args.no_browser:
         browser_thread = threading.Thread(target=open_browser, args=(args.port,))
@@ -15,6 +15,7 @@ from django.utils.html import format_html
 from django.urls import reverse, path
 from django.shortcuts import render, redirect
 from django.http import HttpResponseRedirect
+from django.db.models import Count
 from django import forms
 from django.utils.safestring import mark_safe
 from .models import Notebook, Cell, Parameter, Execution, NotebookSession, ChartType, DashboardChart, DashboardChartParameter
@@ -332,9 +333,13 @@ class NotebookAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(_cell_count=Count('cells'))
+
     def cell_count(self, obj):
-        return obj.cells.count()
+        return obj._cell_count
     cell_count.short_description = 'Cells'
+    cell_count.admin_order_field = '_cell_count'
 
     def view_link(self, obj):
         url = reverse('notebook:detail', args=[obj.slug])
@@ -4,6 +4,8 @@ Handles Python code execution with parameter substitution.
 """
 import sys
 import io
+import importlib
+import threading
 import time
 import traceback
 import re
@@ -11,6 +13,7 @@ import json
 from types import ModuleType
 from typing import Dict, Any, Optional, Tuple
 from contextlib import redirect_stdout, redirect_stderr
+from functools import lru_cache
 import uuid
 
 # Global container for HTML outputs - uses a mutable container so mocks can find current outputs
@@ -339,6 +342,17 @@ def get_current_outputs():
     return _output_container.html_outputs
 
 
+@lru_cache(maxsize=256)
+def _compile_cell(code: str):
+    """
+    Compile cell source to a code object, reusing it for identical source.
+
+    Re-running a cell with the same parameters (or none) skips the parser and
+    code generator. SyntaxErrors propagate and are not cached.
+    """
+    return compile(code, "<string>", "exec")
+
+
 class CellExecutor:
     """
     Executes notebook cells in an isolated namespace with parameter substitution.
@@ -845,7 +859,7 @@ class CellExecutor:
                 self.namespace['set_trace'] = notifying_set_trace
 
             with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                exec(code, self.namespace)
+                exec(_compile_cell(code), self.namespace)
 
             # After execution, patch any newly imported modules (like tyk.py)
             self._patch_imported_modules()
@@ -974,3 +988,26 @@ class SessionManager:
 
 # Global session manager
 session_manager = SessionManager()
+
+# Heavy libraries that notebook setup cells almost always import
+_PRELOAD_MODULES = ("numpy", "pandas", "plotly.graph_objs", "plotly.io")
+
+
+def preload_modules_in_background() -> threading.Thread:
+    """
+    Import common notebook libraries on a daemon thread at server startup.
+
+    Cells run in-process, so once a module is in sys.modules every session's
+    ``import pandas`` is a dictionary lookup. This moves the one-time import
+    cost off the first user's setup request.
+    """
+    def _preload():
+        for name in _PRELOAD_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=_preload, name="tyk-preload", daemon=True)
+    thread.start()
+    return thread
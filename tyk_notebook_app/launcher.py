@@ -73,7 +73,23 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = BASE_DIR.parent
 
-SECRET_KEY = 'tyk-notebook-dev-key-change-in-production-' + os.urandom(16).hex()
+
+def _load_or_create_secret_key():
+    key_file = BASE_DIR / '.secret_key'
+    try:
+        key = key_file.read_text().strip()
+    except FileNotFoundError:
+        key = ''
+    if not key:
+        # Missing or empty: generate a key readable only by its owner
+        key = 'tyk-notebook-dev-key-' + os.urandom(32).hex()
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(key)
+    return key
+
+
+SECRET_KEY = os.environ.get('TYK_SECRET_KEY') or _load_or_create_secret_key()
 
 DEBUG = True
 
@@ -270,6 +286,9 @@ def open_browser(port):
 def run_server(port=8001, open_browser_flag=True):
     """Run the development server"""
     from django.core.management import call_command
+    from tyk_notebook_app.executor import preload_modules_in_background
+
+    preload_modules_in_background()
 
     if open_browser_flag:
         browser_thread = threading.Thread(target=open_browser, args=(port,))
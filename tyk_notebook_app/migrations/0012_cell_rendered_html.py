@@ -0,0 +1,28 @@
+import markdown
+from django.db import migrations, models
+
+
+def render_existing_descriptions(apps, schema_editor):
+    Cell = apps.get_model('tyk_notebook_app', 'Cell')
+    cells = list(Cell.objects.exclude(description='').only('id', 'description'))
+    for cell in cells:
+        cell.rendered_html = markdown.markdown(
+            cell.description, extensions=['fenced_code', 'tables', 'nl2br']
+        )
+    Cell.objects.bulk_update(cells, ['rendered_html'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tyk_notebook_app', '0011_notebook_overview_enabled'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cell',
+            name='rendered_html',
+            field=models.TextField(blank=True, editable=False, help_text='Description rendered to HTML on save'),
+        ),
+        migrations.RunPython(render_existing_descriptions, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,57 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 import json
+import re
+import threading
+from functools import lru_cache
+
+import markdown
+
+_markdown_local = threading.local()
+
+# Single-line text with no markdown syntax renders as one plain paragraph
+_PLAIN_TEXT_RE = re.compile(r"[^\W\d_](?:[^\W_]|[ ,.;:'\"?()/%])*")
+
+
+def _markdown_renderer() -> markdown.Markdown:
+    """Per-thread Markdown instance, so the extensions are only loaded once"""
+    md = getattr(_markdown_local, "md", None)
+    if md is None:
+        md = _markdown_local.md = markdown.Markdown(
+            extensions=['fenced_code', 'tables', 'nl2br']
+        )
+    return md
+
+
+@lru_cache(maxsize=512)
+def render_markdown(text: str) -> str:
+    """Render markdown to HTML (memoized by content)"""
+    if not text:
+        return ""
+    if text[-1] != " " and _PLAIN_TEXT_RE.fullmatch(text):
+        return f"<p>{text}</p>"
+    return _markdown_renderer().reset().convert(text)
+
+
+def _format_param_value(param_type: str, value) -> str:
+    """Format a parameter value as a Python literal based on its type"""
+    if param_type in ('string', 'dropdown'):
+        return f'"{value}"'
+    if param_type == 'number':
+        return str(value)
+    if param_type == 'boolean':
+        return 'True' if value else 'False'
+    return repr(value)
+
+
+@lru_cache(maxsize=256)
+def _param_assignment_pattern(names: tuple) -> re.Pattern:
+    """Compile one pattern matching the assignment line of any of the given parameters"""
+    alternatives = '|'.join(map(re.escape, names))
+    return re.compile(
+        rf'^(?P<prefix>(?P<name>{alternatives})\s*=\s*).*?(?P<comment>#.*)?$',
+        re.MULTILINE,
+    )
 
 
 class Notebook(models.Model):
@@ -45,6 +96,7 @@ class Cell(models.Model):
     cell_type = models.CharField(max_length=20, choices=CELL_TYPE_CHOICES, default='code')
     source_code = models.TextField(blank=True, help_text="Source code (required for code cells, optional for markdown)")
     description = models.TextField(blank=True, help_text="Markdown content shown above the cell")
+    rendered_html = models.TextField(blank=True, editable=False, help_text="Description rendered to HTML on save")
     is_active = models.BooleanField(default=True, help_text="Show this cell in the notebook/dashboard view")
     is_executable = models.BooleanField(default=True)
     auto_run = models.BooleanField(default=False, help_text="Run automatically when parameters change")
@@ -58,33 +110,31 @@ class Cell(models.Model):
     def __str__(self):
         return f"{self.notebook.name} - Cell {self.order}: {self.title or 'Untitled'}"
 
+    def save(self, *args, **kwargs):
+        self.rendered_html = render_markdown(self.description)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'description' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'rendered_html'}
+        super().save(*args, **kwargs)
+
     def get_code_with_params(self, param_values: dict) -> str:
         """
         Replace parameter placeholders in source code with actual values.
+        All assignment lines are rewritten in a single regex pass.
         """
-        code = self.source_code
-        for param in self.parameters.all():
-            if param.name in param_values:
-                value = param_values[param.name]
-                # Format value based on type
-                if param.param_type == 'string':
-                    formatted_value = f'"{value}"'
-                elif param.param_type == 'dropdown':
-                    formatted_value = f'"{value}"'
-                elif param.param_type == 'number':
-                    formatted_value = str(value)
-                elif param.param_type == 'boolean':
-                    formatted_value = 'True' if value else 'False'
-                else:
-                    formatted_value = repr(value)
-
-                # Replace the parameter assignment line
-                import re
-                pattern = rf'^({param.name}\s*=\s*).*?(#.*)?$'
-                replacement = rf'\1{formatted_value}  \2' if r'\2' else rf'\1{formatted_value}'
-                code = re.sub(pattern, replacement, code, flags=re.MULTILINE)
-
-        return code
+        replacements = {
+            param.name: _format_param_value(param.param_type, param_values[param.name])
+            for param in self.parameters.all()
+            if param.name in param_values
+        }
+        if not replacements:
+            return self.source_code
+
+        def replace(match):
+            comment = match.group('comment') or ''
+            return f"{match.group('prefix')}{replacements[match.group('name')]}  {comment}"
+
+        return _param_assignment_pattern(tuple(replacements)).sub(replace, self.source_code)
 
 
 class Parameter(models.Model):
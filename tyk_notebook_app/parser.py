@@ -3,13 +3,41 @@ Parser for Colab-style @param directives and notebook files.
 Extracts cells, parameters, and metadata from .py and .ipynb files.
 """
 import re
+import io
+import copy
 import json
 import os
+import sys
+import tokenize
+from ast import literal_eval as _literal_eval
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+# Interned type tags: these few values are compared repeatedly downstream,
+# so share a single string object for each of them.
+_PT_DROPDOWN = sys.intern('dropdown')
+_PT_STRING = sys.intern('string')
+_PT_NUMBER = sys.intern('number')
+_PT_BOOLEAN = sys.intern('boolean')
+_PT_SLIDER = sys.intern('slider')
 
-@dataclass
+_CT_CODE = sys.intern('code')
+_CT_MARKDOWN = sys.intern('markdown')
+_CT_SETUP = sys.intern('setup')
+
+# Parsed cells keyed by (abspath, st_mtime_ns, st_size); see parse_file
+_PARSE_CACHE_MAX_ENTRIES = 32
+_parse_cache: Dict[tuple, List['ParsedCell']] = {}
+
+# Substrings marking setup/initialization cells, pre-lowercased for matching
+_SETUP_KEYWORDS = tuple(kw.lower() for kw in (
+    'import ', 'from ', 'pip install', '!pip',
+    'drive.mount', 'google.colab', 'Inicializando',
+    'Estableciendo conexión', 'class TyK'
+))
+
+
+@dataclass(slots=True)
 class ParsedParameter:
     """Represents a parsed @param directive"""
     name: str
@@ -21,15 +49,16 @@ class ParsedParameter:
     step: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedCell:
     """Represents a parsed notebook cell"""
     title: str = ""
     source_code: str = ""
     description: str = ""
-    cell_type: str = "code"  # 'code', 'markdown', 'setup'
+    cell_type: str = _CT_CODE  # 'code', 'markdown', 'setup'
     auto_run: bool = False
     is_setup_cell: bool = False
+    is_executable: bool = True
     parameters: List[ParsedParameter] = field(default_factory=list)
 
 
@@ -52,16 +81,25 @@ class ColabNotebookParser:
     # Matches: # @title Title Text {"run":"auto"}
     # Group 1: Title text (optional, anything not starting with {)
     # Group 2: Options JSON content (optional)
+    # Anchored to the line start and restricted to delimiter-free character
+    # classes so non-matching lines fail fast instead of backtracking.
     TITLE_PATTERN = re.compile(
-        r'#\s*@title\s*(?:([^{\n]+?)\s*)?(?:\{(.+?)\})?\s*$',
+        r'^[ \t]*#[ \t]*@title[ \t]*(?:([^{\n]+?)[ \t]*)?(?:\{([^}\n]*)\})?\s*$',
         re.MULTILINE
     )
 
+    # Group 2 (the default) may contain '#' only inside a quoted string. Quotes
+    # are excluded from the last alternative so each string has exactly one
+    # way to match; otherwise a line of strings and a plain comment backtracks
+    # exponentially
     PARAM_PATTERN = re.compile(
-        r'^(\w+)\s*=\s*(.+?)\s*#\s*@param\s*(.*)$',
+        r'^(\w+)[ \t]*=[ \t]*((?:"[^"\n]*"|\'[^\'\n]*\'|[^#\n"\'])+?)[ \t]*#[ \t]*@param[ \t]*(.*)$',
         re.MULTILINE
     )
 
+    # Matches a param spec that only declares its type: {"type":"string"}, {"type":null}
+    TYPE_ONLY_SPEC_PATTERN = re.compile(r'\{\s*"type"\s*:\s*(?:"(\w+)"|null)\s*\}$')
+
     MARKDOWN_START = re.compile(r'^"""(.*)$', re.MULTILINE)
     MARKDOWN_END = re.compile(r'^(.*)"""$', re.MULTILINE)
 
@@ -71,11 +109,26 @@ class ColabNotebookParser:
         self.setup_imports: List[str] = []
 
     def parse_file(self, filepath: str) -> List[ParsedCell]:
-        """Parse a .py or .ipynb file and return list of cells"""
-        if filepath.endswith('.ipynb'):
-            return self.parse_ipynb(filepath)
-        else:
-            return self.parse_py(filepath)
+        """
+        Parse a .py or .ipynb file and return list of cells.
+        Results are cached per (path, mtime, size), so re-parsing an
+        unchanged file only costs a stat call.
+        """
+        st = os.stat(filepath)
+        key = (os.path.abspath(filepath), st.st_mtime_ns, st.st_size)
+        cached = _parse_cache.get(key)
+        if cached is None:
+            if filepath.endswith('.ipynb'):
+                cached = self.parse_ipynb(filepath)
+            else:
+                cached = self.parse_py(filepath)
+            if len(_parse_cache) >= _PARSE_CACHE_MAX_ENTRIES:
+                _parse_cache.pop(next(iter(_parse_cache)))
+            _parse_cache[key] = cached
+
+        # Hand out copies so callers can't mutate the cached cells
+        self.cells = copy.deepcopy(cached)
+        return self.cells
 
     def parse_py(self, filepath: str) -> List[ParsedCell]:
         """Parse a Colab-exported Python file"""
@@ -87,7 +140,11 @@ class ColabNotebookParser:
     def parse_py_content(self, content: str) -> List[ParsedCell]:
         """Parse Python content from a Colab export"""
         self.cells = []
-        lines = content.split('\n')
+        # Split on '\n' only, as the tokenizer does; str.splitlines() would
+        # also break on \x0c, \u2028 etc. inside string literals
+        lines = [line.rstrip('\r') for line in content.split('\n')]
+        if lines and not lines[-1]:
+            lines.pop()
 
         current_cell_lines = []
         current_cell = ParsedCell()
@@ -108,7 +165,7 @@ class ColabNotebookParser:
             """Helper to create a markdown cell"""
             if md_text.strip():
                 md_cell = ParsedCell()
-                md_cell.cell_type = 'markdown'
+                md_cell.cell_type = _CT_MARKDOWN
                 md_cell.source_code = md_text
                 md_cell.is_executable = False
                 # Extract title from first line if it's a heading
@@ -117,24 +174,39 @@ class ColabNotebookParser:
                     md_cell.title = first_line.lstrip('#').strip()
                 self.cells.append(md_cell)
 
+        # Module-level triple-quoted strings, found by the tokenizer; None
+        # means it could not tokenize the source, so fall back to line scanning
+        markdown_blocks = self._find_markdown_blocks(content)
+
         i = 0
         while i < len(lines):
             line = lines[i]
+            stripped = line.strip()
+
+            if markdown_blocks is not None:
+                block = markdown_blocks.get(i)
+                if block is not None:
+                    # Save any accumulated code first
+                    save_current_cell()
+                    end_line, md_text = block
+                    create_markdown_cell(md_text)
+                    i = end_line + 1
+                    continue
 
-            # Check for markdown block start
-            if line.strip().startswith('"""') and not in_markdown:
+            # Check for markdown block start (fallback when tokenizing failed)
+            elif stripped.startswith('"""') and not in_markdown:
                 # Save any accumulated code first
                 save_current_cell()
 
                 in_markdown = True
                 markdown_content = []
                 # Check if it's a single-line markdown
-                if line.strip().endswith('"""') and len(line.strip()) > 6:
-                    md_text = line.strip()[3:-3]
+                if stripped.endswith('"""') and len(stripped) > 6:
+                    md_text = stripped[3:-3]
                     create_markdown_cell(md_text)
                     in_markdown = False
                 else:
-                    md_start = line.strip()[3:]
+                    md_start = stripped[3:]
                     if md_start:
                         markdown_content.append(md_start)
                 i += 1
@@ -142,8 +214,8 @@ class ColabNotebookParser:
 
             # Inside markdown block
             if in_markdown:
-                if line.strip().endswith('"""'):
-                    md_end = line.strip()[:-3]
+                if stripped.endswith('"""'):
+                    md_end = stripped[:-3]
                     if md_end:
                         markdown_content.append(md_end)
                     create_markdown_cell('\n'.join(markdown_content))
@@ -153,8 +225,15 @@ class ColabNotebookParser:
                 i += 1
                 continue
 
+            # Cheap prefilter: both @title and @param need a '#', so plain
+            # code lines skip the regex engine entirely
+            if '#' not in line:
+                current_cell_lines.append(line)
+                i += 1
+                continue
+
             # Check for @title directive (new cell)
-            title_match = self.TITLE_PATTERN.search(line)
+            title_match = self.TITLE_PATTERN.search(line) if stripped.startswith('#') else None
             if title_match:
                 # Save previous cell if exists
                 save_current_cell()
@@ -192,6 +271,40 @@ class ColabNotebookParser:
 
         return self.cells
 
+    def _find_markdown_blocks(self, content: str) -> Optional[Dict[int, Tuple[int, str]]]:
+        """
+        Locate markdown blocks (triple-quoted strings starting a statement at
+        column 0) using the tokenizer, which handles both quote styles and
+        escaped quotes correctly.
+
+        Returns a mapping of start line index -> (end line index, markdown text),
+        or None if the content cannot be tokenized.
+        """
+        blocks = {}
+        prev_type = None
+        try:
+            for tok in tokenize.generate_tokens(io.StringIO(content).readline):
+                if (tok.type == tokenize.STRING and tok.start[1] == 0
+                        and tok.string.startswith(('"""', "'''"))
+                        and prev_type in (None, tokenize.NEWLINE, tokenize.NL,
+                                          tokenize.INDENT, tokenize.DEDENT)):
+                    start_line, end_line = tok.start[0] - 1, tok.end[0] - 1
+                    inner = tok.string[3:-3]
+                    if start_line != end_line:
+                        # Mirror line-based extraction: drop the empty remainder
+                        # of the opening and closing delimiter lines
+                        parts = [part.rstrip('\r') for part in inner.split('\n')]
+                        first, last = parts[0].rstrip(), parts[-1].lstrip()
+                        parts = ([first] if first else []) + parts[1:-1] + ([last] if last else [])
+                        inner = '\n'.join(parts)
+                    blocks[start_line] = (end_line, inner)
+                if tok.type != tokenize.COMMENT:
+                    prev_type = tok.type
+        except (tokenize.TokenError, SyntaxError):
+            return None
+
+        return blocks
+
     def parse_ipynb(self, filepath: str) -> List[ParsedCell]:
         """Parse a Jupyter notebook file"""
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -206,7 +319,7 @@ class ColabNotebookParser:
             if cell_type == 'markdown':
                 # Create a markdown cell
                 md_cell = ParsedCell()
-                md_cell.cell_type = 'markdown'
+                md_cell.cell_type = _CT_MARKDOWN
                 md_cell.source_code = source
                 md_cell.is_executable = False
                 # Extract title from first line if it's a heading
@@ -254,7 +367,7 @@ class ColabNotebookParser:
 
         param = ParsedParameter(
             name=var_name,
-            param_type='string',
+            param_type=_PT_STRING,
             default_value=None
         )
 
@@ -267,29 +380,32 @@ class ColabNotebookParser:
             if param_spec.startswith('['):
                 try:
                     options = json.loads(param_spec)
-                    param.param_type = 'dropdown'
+                    param.param_type = _PT_DROPDOWN
                     param.options = options
                 except json.JSONDecodeError:
                     pass
             # Check if it's a type specification
             elif param_spec.startswith('{'):
+                # Plain {"type": ...} specs skip the JSON decoder; sliders
+                # and anything else with extra keys fall through to json
+                type_only = self.TYPE_ONLY_SPEC_PATTERN.match(param_spec)
                 try:
-                    spec = json.loads(param_spec)
+                    spec = {'type': type_only.group(1)} if type_only else json.loads(param_spec)
                     type_val = spec.get('type')
 
                     if type_val is None:
-                        param.param_type = 'number'
+                        param.param_type = _PT_NUMBER
                     elif type_val == 'string':
-                        param.param_type = 'string'
+                        param.param_type = _PT_STRING
                     elif type_val == 'boolean':
-                        param.param_type = 'boolean'
+                        param.param_type = _PT_BOOLEAN
                     elif type_val == 'slider':
-                        param.param_type = 'slider'
+                        param.param_type = _PT_SLIDER
                         param.min_value = spec.get('min', 0)
                         param.max_value = spec.get('max', 100)
                         param.step = spec.get('step', 1)
                     elif type_val == 'integer':
-                        param.param_type = 'number'
+                        param.param_type = _PT_NUMBER
                 except json.JSONDecodeError:
                     pass
 
@@ -297,16 +413,13 @@ class ColabNotebookParser:
 
     def _parse_default_value(self, raw: str) -> Any:
         """Parse the default value from Python code"""
+        # PARAM_PATTERN stops at the first '#' outside quotes, so any '#'
+        # left in raw belongs to a string value such as "#ff0000"
         raw = raw.strip()
 
-        # Remove trailing comment if present
-        if '#' in raw:
-            raw = raw.split('#')[0].strip()
-
         # Try to evaluate as Python literal
         try:
-            import ast
-            return ast.literal_eval(raw)
+            return _literal_eval(raw)
         except (ValueError, SyntaxError):
             # Return as string, stripping quotes if present
             if (raw.startswith('"') and raw.endswith('"')) or \
@@ -316,24 +429,22 @@ class ColabNotebookParser:
 
     def _identify_setup_cells(self):
         """Identify cells that are setup/initialization cells"""
-        setup_keywords = [
-            'import ', 'from ', 'pip install', '!pip',
-            'drive.mount', 'google.colab', 'Inicializando',
-            'Estableciendo conexión', 'class TyK'
-        ]
-
         for cell in self.cells:
             source_lower = cell.source_code.lower()
             title_lower = cell.title.lower() if cell.title else ""
 
             # Check for setup indicators
-            is_setup = any(kw.lower() in source_lower or kw.lower() in title_lower
-                         for kw in setup_keywords)
+            is_setup = any(kw in source_lower or kw in title_lower
+                           for kw in _SETUP_KEYWORDS)
 
             # Also mark as setup if no parameters and appears early
             if is_setup and not cell.parameters:
                 cell.is_setup_cell = True
-                cell.cell_type = 'setup'
+                cell.cell_type = _CT_SETUP
+
+
+# Matches the TyK class body up to the next top-level class or end of file
+_CLASS_TYK_RE = re.compile(r'^class TyK:[\s\S]*?(?=^class |\Z)', re.MULTILINE)
 
 
 def extract_tyk_class(filepath: str) -> str:
@@ -344,31 +455,27 @@ def extract_tyk_class(filepath: str) -> str:
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Find the class definition
-    class_pattern = re.compile(
-        r'^class TyK:.*?(?=^class |\Z)',
-        re.MULTILINE | re.DOTALL
-    )
-
-    match = class_pattern.search(content)
+    match = _CLASS_TYK_RE.search(content)
     if match:
         return match.group(0)
 
     return ""
 
 
+_IMPORT_PREFIXES = ('import ', 'from ')
+
+
 def get_imports_from_file(filepath: str) -> str:
     """Extract all import statements from a file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
     imports = []
-    for line in content.split('\n'):
-        stripped = line.strip()
-        if stripped.startswith('import ') or stripped.startswith('from '):
-            imports.append(line)
-        elif stripped.startswith('!pip install'):
-            # Convert pip install to comment (handled separately)
-            imports.append(f"# {stripped}")
+    # Stream the file line by line instead of materializing the full content
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith(_IMPORT_PREFIXES):
+                imports.append(line.rstrip('\n'))
+            elif stripped.startswith('!pip install'):
+                # Convert pip install to comment (handled separately)
+                imports.append(f"# {stripped}")
 
     return '\n'.join(imports)
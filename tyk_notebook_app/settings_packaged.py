@@ -15,9 +15,26 @@ else:
 
 # Data directory (writable location)
 DATA_DIR = Path(os.environ.get("TYK_DB_PATH", RUNTIME_DIR / "tyk_data"))
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+if not DATA_DIR.exists():
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-SECRET_KEY = 'tyk-notebook-standalone-key-change-in-production'
+
+def _load_or_create_secret_key():
+    key_file = DATA_DIR / '.secret_key'
+    try:
+        key = key_file.read_text().strip()
+    except FileNotFoundError:
+        key = ''
+    if not key:
+        # Missing or empty: generate a key readable only by its owner
+        key = 'tyk-notebook-standalone-key-' + os.urandom(32).hex()
+        fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(key)
+    return key
+
+
+SECRET_KEY = os.environ.get('TYK_SECRET_KEY') or _load_or_create_secret_key()
 
 DEBUG = True
 
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the TyK Notebook test suite
+"""
+from django.contrib.auth.models import User
+from tyk_notebook_app.executor import session_manager
+
+
+def create_test_user(username="testuser"):
+    """
+    Create a user for tests that authenticate with Client.force_login().
+
+    The password is left unusable, so no password hasher runs at all.
+    """
+    return User.objects.create_user(username=username)
+
+
+def create_test_users(*usernames):
+    """Create several force_login() users with a single multi-row INSERT"""
+    users = [User(username=username) for username in usernames]
+    for user in users:
+        user.set_unusable_password()
+    return User.objects.bulk_create(users)
+
+
+def clear_executor_sessions():
+    """
+    Drop every in-process executor session.
+
+    Executors are keyed by user id, and ids can be reused once a test's
+    transaction is rolled back, so kernel state could otherwise leak into
+    whichever test the parallel runner schedules next in the same worker.
+    """
+    session_manager.sessions.clear()
@@ -1,15 +1,38 @@
 """
 Tests for code execution functionality
 """
-from django.test import TestCase
-from tyk_notebook_app.executor import CellExecutor, SessionManager
+import matplotlib
+matplotlib.use('Agg', force=True)
+import matplotlib.pyplot as plt  # noqa: E402
 
+# Initialize the Agg backend and font cache once per process, not per
+# plotting test (before the executor installs its IPython mocks)
+plt.figure()
+plt.close('all')
 
-class CellExecutorTest(TestCase):
-    """Test CellExecutor class"""
+from django.test import TestCase  # noqa: E402
+from tyk_notebook_app.executor import CellExecutor, SessionManager  # noqa: E402
 
-    def setUp(self):
-        self.executor = CellExecutor()
+
+class SharedExecutorMixin:
+    """Build one CellExecutor per test class and restore its namespace after each test"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.executor = CellExecutor()
+        cls._initial_namespace = dict(cls.executor.namespace)
+
+    def tearDown(self):
+        self.executor.namespace.clear()
+        self.executor.namespace.update(self._initial_namespace)
+        self.executor._html_outputs.clear()
+        self.executor._plot_outputs.clear()
+        super().tearDown()
+
+
+class CellExecutorTest(SharedExecutorMixin, TestCase):
+    """Test CellExecutor class"""
 
     def test_simple_execution(self):
         """Test executing simple Python code"""
@@ -237,12 +260,9 @@ class SessionManagerTest(TestCase):
         self.assertIsNotNone(executor)
 
 
-class ExecutorParameterHandlingTest(TestCase):
+class ExecutorParameterHandlingTest(SharedExecutorMixin, TestCase):
     """Test parameter handling in executor"""
 
-    def setUp(self):
-        self.executor = CellExecutor()
-
     def test_string_parameter_quoting(self):
         """Test string parameters are properly quoted"""
         code = 'name = "default"'
@@ -285,12 +305,9 @@ class ExecutorParameterHandlingTest(TestCase):
         self.assertEqual(result, {"b": 2})
 
 
-class ExecutorHTMLOutputTest(TestCase):
+class ExecutorHTMLOutputTest(SharedExecutorMixin, TestCase):
     """Test HTML output capture"""
 
-    def setUp(self):
-        self.executor = CellExecutor()
-
     def test_plotly_output(self):
         """Test plotly charts are captured as HTML"""
         code = """
@@ -333,12 +350,9 @@ plt.show()
         self.assertIn('script', stdout)
 
 
-class ExecutorErrorHandlingTest(TestCase):
+class ExecutorErrorHandlingTest(SharedExecutorMixin, TestCase):
     """Test error handling in executor"""
 
-    def setUp(self):
-        self.executor = CellExecutor()
-
     def test_zero_division_error(self):
         """Test division by zero is caught"""
         code = "x = 1 / 0"
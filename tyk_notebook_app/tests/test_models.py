@@ -1,16 +1,20 @@
 """
 Tests for Django models
 """
+import markdown
 from django.test import TestCase
-from django.contrib.auth.models import User
-from tyk_notebook_app.models import Notebook, Cell, Parameter, Execution, NotebookSession
+from tyk_notebook_app.models import (
+    Notebook, Cell, Parameter, Execution, NotebookSession, render_markdown
+)
+from tyk_notebook_app.tests.fixtures import create_test_user
 
 
 class NotebookModelTest(TestCase):
     """Test Notebook model"""
 
-    def setUp(self):
-        self.notebook = Notebook.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook",
             description="Test description",
@@ -62,13 +66,14 @@ class NotebookModelTest(TestCase):
 class CellModelTest(TestCase):
     """Test Cell model"""
 
-    def setUp(self):
-        self.notebook = Notebook.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook"
         )
-        self.cell = Cell.objects.create(
-            notebook=self.notebook,
+        cls.cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             title="Test Cell",
             source_code="x = 42",
@@ -112,6 +117,23 @@ class CellModelTest(TestCase):
         )
         self.assertEqual(markdown_cell.source_code, "")
 
+    def test_description_rendered_on_save(self):
+        """Test description markdown is rendered to HTML when saved"""
+        self.assertEqual(self.cell.rendered_html, "")
+
+        self.cell.description = "# Heading"
+        self.cell.save(update_fields=["description"])
+        self.cell.refresh_from_db()
+        self.assertIn("<h1>Heading</h1>", self.cell.rendered_html)
+
+    def test_plain_description_matches_markdown(self):
+        """Test plain-text descriptions skip the parser but render identically"""
+        for text in ["Compute summary statistics (50% sample).", "Title: *bold*", "1. First"]:
+            self.assertEqual(
+                render_markdown(text),
+                markdown.markdown(text, extensions=['fenced_code', 'tables', 'nl2br'])
+            )
+
     def test_get_code_with_params(self):
         """Test parameter substitution in code"""
         cell = Cell.objects.create(
@@ -146,15 +168,16 @@ class CellModelTest(TestCase):
 class ParameterModelTest(TestCase):
     """Test Parameter model"""
 
-    def setUp(self):
-        self.notebook = Notebook.objects.create(name="NB", slug="nb")
-        self.cell = Cell.objects.create(
-            notebook=self.notebook,
+    @classmethod
+    def setUpTestData(cls):
+        cls.notebook = Notebook.objects.create(name="NB", slug="nb")
+        cls.cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             source_code="x = 1"
         )
-        self.param = Parameter.objects.create(
-            cell=self.cell,
+        cls.param = Parameter.objects.create(
+            cell=cls.cell,
             name="test_param",
             param_type="string",
             default_value="test",
@@ -175,15 +198,22 @@ class ParameterModelTest(TestCase):
         """Test all parameter types can be created"""
         types = ['dropdown', 'string', 'number', 'boolean', 'slider']
 
-        for i, ptype in enumerate(types):
-            param = Parameter.objects.create(
+        Parameter.objects.bulk_create([
+            Parameter(
                 cell=self.cell,
                 name=f"param_{ptype}",
                 param_type=ptype,
                 default_value="default",
                 order=i + 2
             )
-            self.assertEqual(param.param_type, ptype)
+            for i, ptype in enumerate(types)
+        ])
+
+        saved = dict(
+            Parameter.objects.filter(cell=self.cell, name__startswith="param_")
+            .values_list("name", "param_type")
+        )
+        self.assertEqual(saved, {f"param_{ptype}": ptype for ptype in types})
 
     def test_get_options_list(self):
         """Test getting options as list"""
@@ -202,10 +232,11 @@ class ParameterModelTest(TestCase):
 class ExecutionModelTest(TestCase):
     """Test Execution model"""
 
-    def setUp(self):
-        self.notebook = Notebook.objects.create(name="NB", slug="nb")
-        self.cell = Cell.objects.create(
-            notebook=self.notebook,
+    @classmethod
+    def setUpTestData(cls):
+        cls.notebook = Notebook.objects.create(name="NB", slug="nb")
+        cls.cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             source_code="print('test')"
         )
@@ -248,12 +279,10 @@ class ExecutionModelTest(TestCase):
 class NotebookSessionModelTest(TestCase):
     """Test NotebookSession model"""
 
-    def setUp(self):
-        self.user = User.objects.create_user(
-            username="testuser",
-            password="testpass"
-        )
-        self.notebook = Notebook.objects.create(name="NB", slug="nb")
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
+        cls.notebook = Notebook.objects.create(name="NB", slug="nb")
 
     def test_session_creation(self):
         """Test notebook session can be created"""
@@ -295,7 +324,7 @@ class NotebookSessionModelTest(TestCase):
 
     def test_multiple_users_same_notebook(self):
         """Test multiple users can have sessions for same notebook"""
-        user2 = User.objects.create_user(username="user2", password="pass")
+        user2 = create_test_user("user2")
 
         session1 = NotebookSession.objects.create(
             notebook=self.notebook,
@@ -0,0 +1,228 @@
+"""
+Tests for the Colab notebook parser
+"""
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+from tyk_notebook_app import parser
+from tyk_notebook_app.parser import ColabNotebookParser
+
+
+class ParamParsingTest(SimpleTestCase):
+    """Test @param extraction from Colab exports"""
+
+    def parse_params(self, source):
+        cells = ColabNotebookParser().parse_py_content(source)
+        return {p.name: p for cell in cells for p in cell.parameters}
+
+    def test_hash_inside_quoted_default(self):
+        """Test a '#' inside a quoted default value is kept"""
+        params = self.parse_params(
+            '# @title Colors\n'
+            'color = "#ff0000" # @param {"type":"string"}\n'
+            'url = \'http://x/#frag\' # @param ["http://x/#frag", "b"]\n'
+        )
+
+        self.assertEqual(params["color"].default_value, "#ff0000")
+        self.assertEqual(params["color"].param_type, "string")
+        self.assertEqual(params["url"].default_value, "http://x/#frag")
+        self.assertEqual(params["url"].options, ["http://x/#frag", "b"])
+
+    def test_strings_with_plain_comment_parse_quickly(self):
+        """Test a line of quoted strings and a non-@param comment does not backtrack"""
+        names = ", ".join(f'"Column {i}"' for i in range(40))
+        source = (
+            '# @title Columns\n'
+            f'cols = [{names}]  # columns to keep\n'
+            'x = ' + '"a"' * 40 + ' # comment\n'
+        )
+
+        start = time.perf_counter()
+        params = self.parse_params(source)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(params, {})
+        self.assertLess(elapsed, 0.5)
+
+
+class PySourceSplittingTest(SimpleTestCase):
+    """Test how .py exports are split into lines"""
+
+    def test_unicode_line_separator_kept_in_string(self):
+        """Test U+2028 inside a string literal does not split the line"""
+        cells = ColabNotebookParser().parse_py_content(
+            '# @title Strings\ns = "a\u2028b"\nprint(s)\n'
+        )
+
+        self.assertEqual(len(cells), 1)
+        self.assertEqual(cells[0].source_code, 's = "a\u2028b"\nprint(s)')
+
+    def test_crlf_line_endings_stripped(self):
+        """Test CRLF exports do not leave '\\r' on each line"""
+        cells = ColabNotebookParser().parse_py_content(
+            '# @title Setup\r\nimport os\r\nprint(os.sep)\r\n'
+        )
+
+        self.assertEqual(cells[0].source_code, 'import os\nprint(os.sep)')
+
+
+class MarkdownBlockTest(SimpleTestCase):
+    """Test detection of module-level triple-quoted markdown blocks"""
+
+    def parse(self, source):
+        return [
+            (cell.cell_type, cell.title, cell.source_code)
+            for cell in ColabNotebookParser().parse_py_content(source)
+        ]
+
+    def test_single_quoted_block(self):
+        """Test ''' blocks become markdown cells like \"\"\" blocks"""
+        cells = self.parse("'''\n# Heading\nText\n'''\n# @title A\nx = 1\n")
+
+        self.assertEqual(cells, [
+            ("markdown", "Heading", "# Heading\nText"),
+            ("code", "A", "x = 1"),
+        ])
+
+    def test_escaped_quotes_inside_block(self):
+        """Test an escaped quote run inside a block does not close it"""
+        source = (
+            '"""\n'
+            'Ends with \\"""\n'
+            "and \\'\\'\\' too\n"
+            '"""\n'
+            '# @title A\n'
+            'x = 1\n'
+        )
+
+        cells = self.parse(source)
+
+        self.assertEqual(cells, [
+            ("markdown", "", 'Ends with \\"""\n' "and \\'\\'\\' too"),
+            ("code", "A", "x = 1"),
+        ])
+
+    def test_indented_and_assigned_strings_stay_code(self):
+        """Test docstrings and assigned triple-quoted strings are not markdown"""
+        source = (
+            '# @title Helper\n'
+            'def f():\n'
+            '    """\n'
+            '    Docstring\n'
+            '    """\n'
+            '    return 1\n'
+            '\n'
+            's = """\n'
+            'not markdown\n'
+            '"""\n'
+        )
+
+        cells = self.parse(source)
+
+        self.assertEqual(len(cells), 1)
+        self.assertEqual(cells[0][0], "code")
+        self.assertEqual(cells[0][2], source.rstrip('\n').split('\n', 1)[1])
+
+    def test_untokenizable_source_falls_back_to_line_scan(self):
+        """Test markdown is still found when the tokenizer rejects the source"""
+        source = '"""\n# Notes\n"""\n# @title Broken\nx = (\n'
+
+        self.assertIsNone(ColabNotebookParser()._find_markdown_blocks(source))
+        self.assertEqual(self.parse(source), [
+            ("markdown", "Notes", "# Notes"),
+            ("code", "Broken", "x = ("),
+        ])
+
+
+class ParseFileCacheTest(SimpleTestCase):
+    """Test the (path, mtime, size) cache behind parse_file"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp_dir = tmp.name
+
+        cache_patcher = mock.patch.dict(parser._parse_cache, clear=True)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+        # Count real parses while keeping their behaviour
+        parse_patcher = mock.patch.object(
+            ColabNotebookParser, 'parse_py',
+            autospec=True, side_effect=ColabNotebookParser.parse_py
+        )
+        self.parse_py = parse_patcher.start()
+        self.addCleanup(parse_patcher.stop)
+
+    def write(self, name, source, mtime_ns=None):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def titles(self, path):
+        return [cell.title for cell in ColabNotebookParser().parse_file(path)]
+
+    def test_unchanged_file_parsed_once(self):
+        """Test a second parse of an unchanged file is served from the cache"""
+        path = self.write('nb.py', '# @title A\nx = 1\n')
+
+        self.assertEqual(self.titles(path), ['A'])
+        self.assertEqual(self.titles(path), ['A'])
+        self.assertEqual(self.parse_py.call_count, 1)
+
+    def test_changed_mtime_reparses(self):
+        """Test a new mtime with the same size parses the file again"""
+        path = self.write('nb.py', '# @title A\nx = 1\n', mtime_ns=1_000_000_000)
+        self.titles(path)
+
+        self.write('nb.py', '# @title B\nx = 1\n', mtime_ns=2_000_000_000)
+
+        self.assertEqual(self.titles(path), ['B'])
+        self.assertEqual(self.parse_py.call_count, 2)
+
+    def test_changed_size_reparses(self):
+        """Test a new size with the same mtime parses the file again"""
+        path = self.write('nb.py', '# @title A\nx = 1\n', mtime_ns=1_000_000_000)
+        self.titles(path)
+
+        self.write('nb.py', '# @title AB\nx = 1\n', mtime_ns=1_000_000_000)
+
+        self.assertEqual(self.titles(path), ['AB'])
+        self.assertEqual(self.parse_py.call_count, 2)
+
+    def test_mutating_result_leaves_cache_intact(self):
+        """Test callers get copies, so editing them does not change later results"""
+        path = self.write('nb.py', '# @title A\nx = 1  # @param {type:"integer"}\n')
+
+        cells = ColabNotebookParser().parse_file(path)
+        cells[0].title = 'Changed'
+        cells[0].parameters.clear()
+        cells.append(cells[0])
+
+        cells = ColabNotebookParser().parse_file(path)
+        self.assertEqual(len(cells), 1)
+        self.assertEqual(cells[0].title, 'A')
+        self.assertEqual([p.name for p in cells[0].parameters], ['x'])
+        self.assertEqual(self.parse_py.call_count, 1)
+
+    def test_cache_bounded_first_in_first_out(self):
+        """Test the cache keeps at most 32 entries and evicts the oldest first"""
+        paths = [
+            self.write(f'nb{i}.py', f'# @title N{i}\nx = {i}\n')
+            for i in range(parser._PARSE_CACHE_MAX_ENTRIES + 1)
+        ]
+        for path in paths:
+            self.titles(path)
+
+        cached_paths = [key[0] for key in parser._parse_cache]
+        self.assertEqual(len(cached_paths), 32)
+        self.assertEqual(cached_paths, [os.path.abspath(p) for p in paths[1:]])
+
+        self.titles(paths[0])
+        self.assertEqual(self.parse_py.call_count, len(paths) + 1)
@@ -0,0 +1,49 @@
+"""
+Tests for the persisted SECRET_KEY loader
+"""
+import os
+import stat
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+from config import settings as project_settings
+
+
+class SecretKeyLoaderTest(SimpleTestCase):
+    """Test the .secret_key file handling in config/settings.py"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.key_file = Path(tmp.name) / '.secret_key'
+
+        patcher = mock.patch.object(project_settings, 'DATA_DIR', Path(tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_key_created_once_and_reused(self):
+        """Test a new key is written on first use and read back afterwards"""
+        key = project_settings._load_or_create_secret_key()
+
+        self.assertTrue(key)
+        self.assertEqual(self.key_file.read_text(), key)
+        self.assertEqual(project_settings._load_or_create_secret_key(), key)
+
+    def test_key_file_owner_only(self):
+        """Test the generated key file is not readable by other users"""
+        if os.name != 'posix':
+            self.skipTest("POSIX permissions only")
+        project_settings._load_or_create_secret_key()
+
+        self.assertEqual(stat.S_IMODE(self.key_file.stat().st_mode), 0o600)
+
+    def test_empty_key_file_regenerated(self):
+        """Test an empty key file is treated as missing"""
+        self.key_file.write_text("\n")
+
+        key = project_settings._load_or_create_secret_key()
+
+        self.assertTrue(key)
+        self.assertEqual(self.key_file.read_text(), key)
@@ -1,28 +1,37 @@
 """
 Tests for views and authentication
 """
+import ast
 import json
-from django.test import TestCase, Client
+from django.test import SimpleTestCase, TestCase, Client, RequestFactory
 from django.urls import reverse
 from django.contrib.auth.models import User
-from tyk_notebook_app.models import Notebook, Cell, Parameter, NotebookSession
+from tyk_notebook_app import views
+from tyk_notebook_app.executor import session_manager
+from tyk_notebook_app.models import Notebook, Cell, Parameter, Execution, NotebookSession
+from tyk_notebook_app.tests.fixtures import (
+    clear_executor_sessions, create_test_user, create_test_users
+)
 
 
 class AuthenticationTest(TestCase):
     """Test authentication requirements"""
 
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
             username="testuser",
             password="testpass123"
         )
-        self.notebook = Notebook.objects.create(
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook",
             is_active=True
         )
 
+    def setUp(self):
+        self.client = Client()
+
     def test_login_required_for_notebook_list(self):
         """Test notebook list requires authentication"""
         response = self.client.get(reverse('notebook:list'))
@@ -73,25 +82,25 @@ class AuthenticationTest(TestCase):
 class NotebookListViewTest(TestCase):
     """Test notebook list view"""
 
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username="testuser",
-            password="testpass123"
-        )
-        self.client.login(username='testuser', password='testpass123')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
 
-        self.notebook1 = Notebook.objects.create(
+        cls.notebook1 = Notebook.objects.create(
             name="Notebook 1",
             slug="notebook-1",
             is_active=True
         )
-        self.notebook2 = Notebook.objects.create(
+        cls.notebook2 = Notebook.objects.create(
             name="Notebook 2",
             slug="notebook-2",
             is_active=True
         )
 
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
     def test_notebook_list_displays_notebooks(self):
         """Test notebook list shows all active notebooks"""
         response = self.client.get(reverse('notebook:list'))
@@ -112,7 +121,7 @@ class NotebookListViewTest(TestCase):
 
     def test_empty_notebook_list(self):
         """Test message shown when no notebooks available"""
-        Notebook.objects.all().delete()
+        Notebook.objects.filter(is_active=True).update(is_active=False)
         response = self.client.get(reverse('notebook:list'))
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "No notebooks available")
@@ -121,36 +130,36 @@ class NotebookListViewTest(TestCase):
 class NotebookDetailViewTest(TestCase):
     """Test notebook detail view"""
 
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username="testuser",
-            password="testpass123"
-        )
-        self.client.login(username='testuser', password='testpass123')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
 
-        self.notebook = Notebook.objects.create(
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook",
             is_active=True
         )
 
-        self.cell = Cell.objects.create(
-            notebook=self.notebook,
+        cls.cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             title="Test Cell",
             source_code="print('Hello')",
             is_executable=True
         )
 
-        self.param = Parameter.objects.create(
-            cell=self.cell,
+        cls.param = Parameter.objects.create(
+            cell=cls.cell,
             name="test_param",
             param_type="string",
             default_value="test",
             order=1
         )
 
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
     def test_notebook_detail_displays_cells(self):
         """Test notebook detail shows cells"""
         response = self.client.get(
@@ -185,31 +194,66 @@ class NotebookDetailViewTest(TestCase):
         ).exists()
         self.assertTrue(session_exists)
 
+    def test_cell_parameters_use_session_values(self):
+        """Test parameter form shows the value saved in the user's session"""
+        NotebookSession.objects.create(
+            notebook=self.notebook,
+            user=self.user,
+            parameter_values={f"{self.cell.id}_test_param": "saved-value"}
+        )
+        response = self.client.get(
+            reverse('notebook:cell_parameters', args=[self.cell.id])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "saved-value")
+
+    def test_notebook_detail_query_count(self):
+        """Test notebook detail query count does not grow with cells"""
+        NotebookSession.objects.create(notebook=self.notebook, user=self.user)
+        for order in range(2, 5):
+            cell = Cell.objects.create(
+                notebook=self.notebook,
+                order=order,
+                source_code=f"y{order} = 1",
+                is_executable=True
+            )
+            Parameter.objects.create(cell=cell, name=f"y{order}", param_type="number")
+
+        request = RequestFactory().get(
+            reverse('notebook:detail', args=[self.notebook.slug])
+        )
+        request.user = self.user
+
+        # Notebook, session, cells, and one prefetch for all parameters
+        with self.assertNumQueries(4):
+            response = views.notebook_detail(request, slug=self.notebook.slug)
+        self.assertEqual(response.status_code, 200)
+
 
 class CellExecutionViewTest(TestCase):
     """Test cell execution view"""
 
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username="testuser",
-            password="testpass123"
-        )
-        self.client.login(username='testuser', password='testpass123')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
 
-        self.notebook = Notebook.objects.create(
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook"
         )
 
-        self.cell = Cell.objects.create(
-            notebook=self.notebook,
+        cls.cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             title="Test Cell",
             source_code="x = 42\nprint(x)",
             is_executable=True
         )
 
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
     def test_cell_execution_requires_authentication(self):
         """Test cell execution requires login"""
         self.client.logout()
@@ -308,31 +352,58 @@ class CellExecutionViewTest(TestCase):
         )
         self.assertEqual(session.parameter_values[f"{param_cell.id}_x"], 25)
 
+    def test_parameter_values_replace_saved_values(self):
+        """Test submitted values replace saved ones, including null and dicts"""
+        session = NotebookSession.objects.create(
+            notebook=self.notebook,
+            user=self.user,
+            parameter_values={
+                "other_key": "kept",
+                f"{self.cell.id}_n": 5,
+                f"{self.cell.id}_opts": {"a": 1, "b": 2},
+            },
+            kernel_state={"setup_complete": True}
+        )
+
+        self.client.post(
+            reverse('notebook:run_cell', args=[self.cell.id]),
+            data=json.dumps({"parameters": {"n": None, "opts": {"a": 3}}}),
+            content_type='application/json'
+        )
+
+        session.refresh_from_db()
+        self.assertEqual(session.parameter_values, {
+            "other_key": "kept",
+            f"{self.cell.id}_n": None,
+            f"{self.cell.id}_opts": {"a": 3},
+        })
+        self.assertTrue(session.kernel_state["setup_complete"])
+
 
 class SetupViewTest(TestCase):
     """Test setup cell execution"""
 
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username="testuser",
-            password="testpass123"
-        )
-        self.client.login(username='testuser', password='testpass123')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
 
-        self.notebook = Notebook.objects.create(
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook"
         )
 
-        self.setup_cell = Cell.objects.create(
-            notebook=self.notebook,
+        cls.setup_cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             title="Setup",
             source_code="import sys\nprint('Setup complete')",
             is_setup_cell=True
         )
 
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
     def test_setup_execution(self):
         """Test setup cells can be executed"""
         response = self.client.post(
@@ -356,31 +427,65 @@ class SetupViewTest(TestCase):
         )
         self.assertTrue(session.kernel_state.get('setup_complete'))
 
+    def test_setup_error_isolated_to_its_cell(self):
+        """Test a broken setup cell is reported on its own and later cells still run"""
+        Cell.objects.create(
+            notebook=self.notebook,
+            order=2,
+            title="Broken",
+            source_code="x = (",
+            is_setup_cell=True
+        )
+        Cell.objects.create(
+            notebook=self.notebook,
+            order=3,
+            title="After",
+            source_code="print('After ran')",
+            is_setup_cell=True
+        )
+
+        response = self.client.post(
+            reverse('notebook:setup', args=[self.notebook.slug])
+        )
+
+        data = response.json()
+        self.assertFalse(data['success'])
+        self.assertIn('Setup complete', data['output'])
+        self.assertIn('After ran', data['output'])
+        self.assertEqual(len(data['errors']), 1)
+        self.assertTrue(data['errors'][0].startswith('Broken:'))
+
+        session = NotebookSession.objects.get(
+            notebook=self.notebook,
+            user=self.user
+        )
+        self.assertFalse(session.kernel_state.get('setup_complete'))
+
 
 class SessionResetViewTest(TestCase):
     """Test session reset functionality"""
 
-    def setUp(self):
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username="testuser",
-            password="testpass123"
-        )
-        self.client.login(username='testuser', password='testpass123')
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
 
-        self.notebook = Notebook.objects.create(
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook"
         )
 
         # Create a session with data
-        self.session = NotebookSession.objects.create(
-            notebook=self.notebook,
-            user=self.user,
+        cls.session = NotebookSession.objects.create(
+            notebook=cls.notebook,
+            user=cls.user,
             parameter_values={"x": 1},
             kernel_state={"setup_complete": True}
         )
 
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
     def test_session_reset(self):
         """Test session can be reset"""
         response = self.client.post(
@@ -399,45 +504,193 @@ class SessionResetViewTest(TestCase):
         self.assertFalse(session_exists)
 
 
-class MultiUserIsolationTest(TestCase):
-    """Test multi-user session isolation"""
+class ApiExecuteViewTest(TestCase):
+    """Test request validation in the code execution API"""
 
-    def setUp(self):
-        self.user1 = User.objects.create_user(
-            username="user1",
-            password="pass1"
+    def test_invalid_json_rejected(self):
+        """Test a malformed body is a client error, not a server error"""
+        response = self.client.post(
+            reverse('notebook:api_execute'),
+            data="{not json",
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_object_body_rejected(self):
+        """Test a JSON body that is not an object is rejected"""
+        response = self.client.post(
+            reverse('notebook:api_execute'),
+            data=json.dumps(["print(1)"]),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ChartCodeBuilderTest(SimpleTestCase):
+    """Test the code generated for dashboard charts"""
+
+    def call_args(self, code):
+        """Parse generated code that must be a single call; return its arguments"""
+        tree = ast.parse(code)
+        self.assertEqual(len(tree.body), 1)
+        call = tree.body[0].value
+        self.assertIsInstance(call, ast.Call)
+        return (
+            [ast.literal_eval(arg) for arg in call.args],
+            {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords},
+        )
+
+    def test_string_params_stay_literals(self):
+        """Test quotes in string params cannot inject code into the call"""
+        payload = '"); import os; os.remove("x"); ("\''
+
+        _, kwargs = self.call_args(views._build_chart_code("world_map", {"colorscale": payload}))
+        self.assertEqual(kwargs["colorscale"], payload)
+
+        args, _ = self.call_args(
+            views._build_chart_code("subclusters_network", {"cluster_id": payload})
         )
-        self.user2 = User.objects.create_user(
-            username="user2",
-            password="pass2"
+        self.assertEqual(args, [payload])
+
+        _, kwargs = self.call_args(views._build_chart_code("cooc_network", {"node_type": payload}))
+        self.assertEqual(kwargs["node_type"], payload)
+
+        args, kwargs = self.call_args(
+            views._build_chart_code("cluster_stats", {"cluster_id": payload, "stuff_type": payload})
+        )
+        self.assertEqual(args, ["TOP", payload])
+        self.assertEqual(kwargs["cluster_top"], payload)
+
+    def test_numeric_params_normalised(self):
+        """Test numeric params are written as numbers"""
+        _, kwargs = self.call_args(
+            views._build_chart_code("cooc_network", {"node_type": "Keywords", "max_nodes": "50.0"})
+        )
+        self.assertEqual(kwargs["node_type"], "K")
+        self.assertEqual(kwargs["max_nodes"], 50)
+
+        _, kwargs = self.call_args(
+            views._build_chart_code("clusters_network", {"min_edge_weight": "0.5"})
+        )
+        self.assertEqual(kwargs["min_edge_weight"], 0.5)
+
+    def test_bad_numeric_params_rejected(self):
+        """Test non-numeric and non-finite numbers are rejected, not emitted as code"""
+        bad_values = ["nan", "inf", "-Infinity", float("inf"), float("nan"), "1; import os", None, [1]]
+        cases = [
+            ("clusters_network", "min_edge_weight"),
+            ("subclusters_network", "min_edge_weight"),
+            ("cooc_network", "max_nodes"),
+        ]
+        for chart_type, name in cases:
+            for value in bad_values:
+                with self.subTest(chart_type=chart_type, value=value):
+                    with self.assertRaises((TypeError, ValueError)):
+                        views._build_chart_code(chart_type, {name: value})
+
+
+class DashboardChartViewTest(TestCase):
+    """Test parameter validation in the dashboard chart endpoint"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
+        cls.notebook = Notebook.objects.create(name="Dashboard NB", slug="dashboard-nb")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.addCleanup(clear_executor_sessions)
+        # Stand in for a completed setup, which puts tyk in the namespace
+        executor = session_manager.get_or_create_session(f"user_{self.user.id}")
+        executor.namespace["tyk"] = object()
+
+    def test_non_finite_number_rejected(self):
+        """Test Infinity and NaN are a client error, not a server error"""
+        url = reverse('notebook:dashboard_chart', args=[self.notebook.slug])
+        for body in [
+            '{"chart_type": "cooc_network", "params": {"max_nodes": Infinity}}',
+            '{"chart_type": "cooc_network", "params": {"max_nodes": "inf"}}',
+            '{"chart_type": "clusters_network", "params": {"min_edge_weight": "nan"}}',
+        ]:
+            with self.subTest(body=body):
+                response = self.client.post(url, data=body, content_type='application/json')
+                self.assertEqual(response.status_code, 400)
+
+
+class ExecutionHistoryViewTest(TestCase):
+    """Test execution history view"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_test_user()
+        cls.notebook = Notebook.objects.create(
+            name="Test Notebook",
+            slug="test-notebook"
         )
+        for order in range(1, 4):
+            cell = Cell.objects.create(
+                notebook=cls.notebook,
+                order=order,
+                title=f"Cell {order}",
+                source_code="x = 1"
+            )
+            Execution.objects.create(cell=cell, status="success", output_text="1")
+        cls.history_url = reverse('notebook:history', args=[cls.notebook.slug])
+
+    def test_history_lists_executions(self):
+        """Test history shows one row per execution"""
+        self.client.force_login(self.user)
+        response = self.client.get(self.history_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Cell 3")
+
+    def test_history_query_count(self):
+        """Test history loads executions and their cells in one query"""
+        request = RequestFactory().get(self.history_url)
+        request.user = self.user
+
+        # Notebook, then executions joined with their cells
+        with self.assertNumQueries(2):
+            response = views.execution_history(request, slug=self.notebook.slug)
+        self.assertEqual(response.status_code, 200)
+
+
+class MultiUserIsolationTest(TestCase):
+    """Test multi-user session isolation"""
 
-        self.notebook = Notebook.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user1, cls.user2 = create_test_users("user1", "user2")
+
+        cls.notebook = Notebook.objects.create(
             name="Test Notebook",
             slug="test-notebook"
         )
 
-        self.cell = Cell.objects.create(
-            notebook=self.notebook,
+        cls.cell = Cell.objects.create(
+            notebook=cls.notebook,
             order=1,
             source_code='x = 1\nprint(x)',
             is_executable=True
         )
 
         Parameter.objects.create(
-            cell=self.cell,
+            cell=cls.cell,
             name="x",
             param_type="number",
             default_value="1"
         )
 
+    def setUp(self):
+        self.addCleanup(clear_executor_sessions)
+
     def test_users_have_separate_sessions(self):
         """Test each user has their own session"""
         client1 = Client()
         client2 = Client()
 
-        client1.login(username='user1', password='pass1')
-        client2.login(username='user2', password='pass2')
+        client1.force_login(self.user1)
+        client2.force_login(self.user2)
 
         # Both access notebook
         client1.get(reverse('notebook:detail', args=[self.notebook.slug]))
@@ -460,8 +713,8 @@ class MultiUserIsolationTest(TestCase):
         client1 = Client()
         client2 = Client()
 
-        client1.login(username='user1', password='pass1')
-        client2.login(username='user2', password='pass2')
+        client1.force_login(self.user1)
+        client2.force_login(self.user2)
 
         # User 1 executes with x=10
         client1.post(
@@ -3,9 +3,9 @@ Django views for TyK Notebook Application.
 Handles notebook display and cell execution.
 """
 import json
+import math
 import mimetypes
 import os
-import markdown
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse, HttpResponse, FileResponse, Http404
 from django.views.decorators.http import require_http_methods
@@ -13,10 +13,13 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.clickjacking import xframe_options_sameorigin
 from django.contrib.auth.decorators import login_required
 from django.conf import settings
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q
 from django.utils.translation import get_language
 
-from .models import Notebook, Cell, Parameter, Execution, NotebookSession, DashboardChart
+from .models import (
+    Notebook, Cell, Parameter, Execution, NotebookSession, DashboardChart, render_markdown
+)
 from .executor import session_manager
 from .importer import export_notebook
 
@@ -141,69 +144,99 @@ _VENN_STYLE_OVERRIDE = """
 """
 
 
-@login_required
-def notebook_list(request):
-    """List all available notebooks"""
-    notebooks = Notebook.objects.filter(is_active=True)
-    return render(request, "notebook/list.html", {"notebooks": notebooks})
+# Columns the notebook/dashboard templates read from cells and parameters
+_DETAIL_CELL_FIELDS = (
+    "id", "notebook_id", "order", "title", "cell_type", "source_code",
+    "auto_run", "rendered_html",
+)
+_DETAIL_PARAM_FIELDS = (
+    "id", "cell_id", "name", "param_type", "default_value", "options",
+    "min_value", "max_value", "step", "order",
+)
 
 
-@login_required
-def notebook_detail(request, slug):
-    """Display a notebook with interactive cells"""
-    notebook = get_object_or_404(Notebook, slug=slug, is_active=True)
+def _user_executor(user, notebook):
+    """
+    Return the user's executor session (keyed by user ID).
 
-    # Get notebook session for parameter persistence (per user)
-    nb_session, created = NotebookSession.objects.get_or_create(
-        notebook=notebook, user=request.user, defaults={"parameter_values": {}}
-    )
+    The data path (TYK_DATA_PATH, else the notebook's source directory) is
+    only resolved when the session has to be created.
+    """
+    session_key = f"user_{user.id}"
+    executor = session_manager.sessions.get(session_key)
+    if executor is None:
+        base_path = getattr(settings, "TYK_DATA_PATH", None) or os.path.dirname(notebook.source_file)
+        executor = session_manager.get_or_create_session(session_key, base_path=base_path)
+    return executor
 
-    # Get cells with their parameters (executable cells + markdown cells)
+
+def _build_cells_data(notebook, saved_values):
+    """
+    Template data for the notebook's visible cells (executable + markdown).
+
+    Parameter values come from the user's saved session values, falling
+    back to each parameter's default.
+    """
     cells = notebook.cells.filter(
         is_active=True
     ).filter(
         Q(is_executable=True) | Q(cell_type='markdown')
-    ).prefetch_related("parameters")
+    ).only(*_DETAIL_CELL_FIELDS).prefetch_related(
+        Prefetch("parameters", queryset=Parameter.objects.only(*_DETAIL_PARAM_FIELDS))
+    )
 
-    # Build cell data with current parameter values
     cells_data = []
     for cell in cells:
-        params_data = []
-        for param in cell.parameters.all():
-            # Get value from session or use default
-            current_value = nb_session.parameter_values.get(
-                f"{cell.id}_{param.name}", param.default_value
-            )
-            params_data.append(
-                {
-                    "id": param.id,
-                    "name": param.name,
-                    "type": param.param_type,
-                    "value": current_value,
-                    "default": param.default_value,
-                    "options": param.get_options_list(),
-                    "min": param.min_value,
-                    "max": param.max_value,
-                    "step": param.step,
-                }
-            )
-
-        # Convert description markdown to HTML
-        description_html = ""
-        if cell.description:
-            description_html = markdown.markdown(
-                cell.description,
-                extensions=['fenced_code', 'tables', 'nl2br']
-            )
+        key_prefix = f"{cell.id}_"
+        params_data = [
+            {
+                "id": param.id,
+                "name": param.name,
+                "type": param.param_type,
+                "value": saved_values.get(key_prefix + param.name, param.default_value),
+                "default": param.default_value,
+                "options": param.get_options_list(),
+                "min": param.min_value,
+                "max": param.max_value,
+                "step": param.step,
+            }
+            for param in cell.parameters.all()
+        ]
 
         cells_data.append(
             {
                 "cell": cell,
                 "parameters": params_data,
-                "has_params": len(params_data) > 0,
-                "description_html": description_html,
+                "has_params": bool(params_data),
+                # Rendered from the markdown description in Cell.save()
+                "description_html": cell.rendered_html,
             }
         )
+    return cells_data
+
+
+@login_required
+def notebook_list(request):
+    """List all available notebooks"""
+    notebooks = (
+        Notebook.objects.filter(is_active=True)
+        .defer("dataset_query", "source_file")
+        .annotate(cell_count=Count("cells"))
+    )
+    return render(request, "notebook/list.html", {"notebooks": notebooks})
+
+
+@login_required
+def notebook_detail(request, slug):
+    """Display a notebook with interactive cells"""
+    notebook = get_object_or_404(Notebook, slug=slug, is_active=True)
+
+    # Get notebook session for parameter persistence (per user)
+    nb_session, created = NotebookSession.objects.get_or_create(
+        notebook=notebook, user=request.user, defaults={"parameter_values": {}}
+    )
+
+    cells_data = _build_cells_data(notebook, nb_session.parameter_values)
 
     context = {
         "notebook": notebook,
@@ -220,34 +253,31 @@ def run_setup(request, slug):
     """Initialize the notebook session by running setup cells"""
     notebook = get_object_or_404(Notebook, slug=slug)
 
-    # Get data path from settings or notebook metadata
-    base_path = getattr(settings, "TYK_DATA_PATH", None)
-    if not base_path:
-        # Try to extract from notebook source
-        base_path = os.path.dirname(notebook.source_file)
-
-    # Create executor session (use user ID as session key)
-    session_key = f"user_{request.user.id}"
-    executor = session_manager.get_or_create_session(session_key, base_path=base_path)
+    executor = _user_executor(request.user, notebook)
 
-    # Run setup cells
-    setup_cells = notebook.cells.filter(is_active=True, is_setup_cell=True).order_by("order")
+    # Run each setup cell on its own, so one failing cell neither hides the
+    # output of the others nor stops the cells after it from loading
+    setup_cells = (
+        notebook.cells.filter(is_active=True, is_setup_cell=True)
+        .order_by("order")
+        .values_list("title", "source_code")
+    )
 
     all_output = []
     errors = []
 
-    for cell in setup_cells:
-        stdout, html, error, exec_time = executor.execute(cell.source_code)
-        all_output.append(f"=== {cell.title or 'Setup'} ===\n{stdout}")
+    for title, source_code in setup_cells:
+        stdout, html, error, exec_time = executor.execute(source_code)
+        all_output.append(f"=== {title or 'Setup'} ===\n{stdout}")
         if error:
-            errors.append(f"{cell.title}: {error}")
+            errors.append(f"{title}: {error}")
 
     # Update session state
     nb_session, _ = NotebookSession.objects.get_or_create(
         notebook=notebook, user=request.user
     )
     nb_session.kernel_state["setup_complete"] = len(errors) == 0
-    nb_session.save()
+    nb_session.save(update_fields=["kernel_state", "updated_at"])
 
     return JsonResponse(
         {
@@ -262,7 +292,12 @@ def run_setup(request, slug):
 @require_http_methods(["POST"])
 def run_cell(request, cell_id):
     """Execute a single cell with provided parameters"""
-    cell = get_object_or_404(Cell, id=cell_id)
+    cell = get_object_or_404(
+        Cell.objects.select_related("notebook").only(
+            "id", "source_code", "notebook__id", "notebook__source_file"
+        ),
+        id=cell_id,
+    )
 
     # Parse parameters from request
     try:
@@ -271,36 +306,32 @@ def run_cell(request, cell_id):
     except json.JSONDecodeError:
         params = {}
 
-    # Get executor (use user ID as session key)
-    session_key = f"user_{request.user.id}"
-    base_path = getattr(settings, "TYK_DATA_PATH", None)
-    if not base_path:
-        base_path = os.path.dirname(cell.notebook.source_file)
-
-    executor = session_manager.get_or_create_session(session_key, base_path=base_path)
+    executor = _user_executor(request.user, cell.notebook)
 
     # Execute cell
     stdout, html, error, exec_time = executor.execute(cell.source_code, params)
 
-    # Record execution
-    execution = Execution.objects.create(
-        cell=cell,
-        parameters=params,
-        status="error" if error else "success",
-        output_text=stdout,
-        output_html=html,
-        error_message=error,
-        execution_time=exec_time,
-    )
+    # Record execution and save parameter values to session in one commit
+    with transaction.atomic():
+        execution = Execution.objects.create(
+            cell=cell,
+            parameters=params,
+            status="error" if error else "success",
+            output_text=stdout,
+            output_html=html,
+            error_message=error,
+            execution_time=exec_time,
+        )
 
-    # Save parameter values to session
-    nb_session, _ = NotebookSession.objects.get_or_create(
-        notebook=cell.notebook, user=request.user
-    )
-    for param_name, value in params.items():
-        nb_session.parameter_values[f"{cell.id}_{param_name}"] = value
-    nb_session.last_executed_cell = cell
-    nb_session.save()
+        nb_session, _ = NotebookSession.objects.get_or_create(
+            notebook=cell.notebook, user=request.user
+        )
+        nb_session.parameter_values.update(
+            {f"{cell.id}_{param_name}": value for param_name, value in params.items()}
+        )
+        nb_session.last_executed_cell = cell
+        # Leave kernel_state untouched; only the columns run_cell changes are written
+        nb_session.save(update_fields=["parameter_values", "last_executed_cell", "updated_at"])
 
     return JsonResponse(
         {
@@ -335,36 +366,30 @@ def reset_session(request, slug):
 @login_required
 def get_cell_parameters(request, cell_id):
     """Get parameter form HTML for a cell"""
-    cell = get_object_or_404(Cell, id=cell_id)
-    parameters = cell.parameters.all()
-
-    # Get current values from session
-    current_values = {}
-    try:
-        nb_session = NotebookSession.objects.get(
-            notebook=cell.notebook, user=request.user
-        )
-        for param in parameters:
-            key = f"{cell.id}_{param.name}"
-            if key in nb_session.parameter_values:
-                current_values[param.name] = nb_session.parameter_values[key]
-    except NotebookSession.DoesNotExist:
-        pass
-
-    params_data = []
-    for param in parameters:
-        params_data.append(
-            {
-                "id": param.id,
-                "name": param.name,
-                "type": param.param_type,
-                "value": current_values.get(param.name, param.default_value),
-                "options": param.get_options_list(),
-                "min": param.min_value,
-                "max": param.max_value,
-                "step": param.step,
-            }
-        )
+    cell = get_object_or_404(Cell.objects.only("id", "notebook_id"), id=cell_id)
+    parameters = cell.parameters.only(*_DETAIL_PARAM_FIELDS)
+
+    # Current values from the session (without loading kernel_state)
+    saved_values = (
+        NotebookSession.objects.filter(notebook_id=cell.notebook_id, user=request.user)
+        .values_list("parameter_values", flat=True)
+        .first()
+    ) or {}
+
+    key_prefix = f"{cell.id}_"
+    params_data = [
+        {
+            "id": param.id,
+            "name": param.name,
+            "type": param.param_type,
+            "value": saved_values.get(key_prefix + param.name, param.default_value),
+            "options": param.get_options_list(),
+            "min": param.min_value,
+            "max": param.max_value,
+            "step": param.step,
+        }
+        for param in parameters
+    ]
 
     return render(
         request,
@@ -380,9 +405,15 @@ def get_cell_parameters(request, cell_id):
 def execution_history(request, slug):
     """View execution history for a notebook"""
     notebook = get_object_or_404(Notebook, slug=slug)
+    # The history table only shows these columns; the joined cell supplies
+    # its title and position, never its source or description
     executions = (
         Execution.objects.filter(cell__notebook=notebook)
         .select_related("cell")
+        .only(
+            "status", "parameters", "execution_time", "created_at",
+            "cell__title", "cell__order",
+        )
         .order_by("-created_at")[:100]
     )
 
@@ -412,6 +443,30 @@ def notebook_export(request, slug):
     return response
 
 
+# Default chart list (always shown unless disabled in the DB)
+_DEFAULT_CHART_TYPES = (
+    ('world_map', 'Global Publications Map', {}),
+    ('clusters_network', 'TOP Clusters Network', {}),
+    ('subclusters_network', 'Subclusters Network', {}),
+    ('cooc_network', 'Co-occurrence Network', {'node_type': 'K', 'max_nodes': 80}),
+    ('cluster_stats', 'Cluster Details', {}),
+    ('venn_diagram', 'Venn Diagram', {}),
+)
+
+# Chart entries and their JSON for notebooks with no DashboardChart rows
+_DEFAULT_CHARTS_DATA = [
+    {
+        'chart_type': ct,
+        'title': title,
+        'default_params': params,
+        'needs_cluster': ct in ('subclusters_network', 'cluster_stats'),
+        'param_defs': [],
+    }
+    for ct, title, params in _DEFAULT_CHART_TYPES
+]
+_DEFAULT_CHARTS_JSON = json.dumps(_DEFAULT_CHARTS_DATA, separators=(",", ":"))
+
+
 @login_required
 def dashboard_detail(request, slug):
     """Display a notebook with split-screen dashboard + cells layout"""
@@ -422,60 +477,7 @@ def dashboard_detail(request, slug):
         notebook=notebook, user=request.user, defaults={"parameter_values": {}}
     )
 
-    # Get cells with their parameters (executable cells + markdown cells)
-    cells = notebook.cells.filter(
-        is_active=True
-    ).filter(
-        Q(is_executable=True) | Q(cell_type='markdown')
-    ).prefetch_related("parameters")
-
-    # Build cell data with current parameter values
-    cells_data = []
-    for cell in cells:
-        params_data = []
-        for param in cell.parameters.all():
-            current_value = nb_session.parameter_values.get(
-                f"{cell.id}_{param.name}", param.default_value
-            )
-            params_data.append(
-                {
-                    "id": param.id,
-                    "name": param.name,
-                    "type": param.param_type,
-                    "value": current_value,
-                    "default": param.default_value,
-                    "options": param.get_options_list(),
-                    "min": param.min_value,
-                    "max": param.max_value,
-                    "step": param.step,
-                }
-            )
-
-        description_html = ""
-        if cell.description:
-            description_html = markdown.markdown(
-                cell.description,
-                extensions=['fenced_code', 'tables', 'nl2br']
-            )
-
-        cells_data.append(
-            {
-                "cell": cell,
-                "parameters": params_data,
-                "has_params": len(params_data) > 0,
-                "description_html": description_html,
-            }
-        )
-
-    # Default chart list (always shown)
-    default_chart_types = [
-        ('world_map', 'Global Publications Map', {}),
-        ('clusters_network', 'TOP Clusters Network', {}),
-        ('subclusters_network', 'Subclusters Network', {}),
-        ('cooc_network', 'Co-occurrence Network', {'node_type': 'K', 'max_nodes': 80}),
-        ('cluster_stats', 'Cluster Details', {}),
-        ('venn_diagram', 'Venn Diagram', {}),
-    ]
+    cells_data = _build_cells_data(notebook, nb_session.parameter_values)
 
     # Build a lookup of ALL DB-configured charts by chart_type key (active and inactive)
     db_charts = {
@@ -483,9 +485,21 @@ def dashboard_detail(request, slug):
         for chart in notebook.dashboard_charts.all().prefetch_related('parameters').select_related('chart_type')
     }
 
+    context = {
+        "notebook": notebook,
+        "cells_data": cells_data,
+        "setup_complete": nb_session.kernel_state.get("setup_complete", False),
+    }
+
+    # Without any DB configuration the chart list is constant
+    if not db_charts:
+        context["charts_data"] = _DEFAULT_CHARTS_DATA
+        context["charts_data_json"] = _DEFAULT_CHARTS_JSON
+        return render(request, "notebook/dashboard.html", context)
+
     # Build entries with sort key: DB order when configured, else fallback index * 100
     raw_charts = []
-    for idx, (ct, default_title, default_params) in enumerate(default_chart_types):
+    for idx, (ct, default_title, default_params) in enumerate(_DEFAULT_CHART_TYPES):
         db_chart = db_charts.get(ct)
         # Skip chart types explicitly disabled in DB
         if db_chart is not None and not db_chart.is_active:
@@ -513,14 +527,8 @@ def dashboard_detail(request, slug):
         raw_charts.append((sort_key, entry))
 
     charts_data = [entry for _, entry in sorted(raw_charts, key=lambda x: x[0])]
-
-    context = {
-        "notebook": notebook,
-        "cells_data": cells_data,
-        "charts_data": charts_data,
-        "charts_data_json": json.dumps(charts_data),
-        "setup_complete": nb_session.kernel_state.get("setup_complete", False),
-    }
+    context["charts_data"] = charts_data
+    context["charts_data_json"] = json.dumps(charts_data, separators=(",", ":"))
 
     return render(request, "notebook/dashboard.html", context)
 
@@ -538,13 +546,7 @@ def render_dashboard_chart(request, slug):
     except json.JSONDecodeError:
         return JsonResponse({"error": "Invalid JSON"}, status=400)
 
-    # Get executor session
-    session_key = f"user_{request.user.id}"
-    base_path = getattr(settings, "TYK_DATA_PATH", None)
-    if not base_path:
-        base_path = os.path.dirname(notebook.source_file)
-
-    executor = session_manager.get_or_create_session(session_key, base_path=base_path)
+    executor = _user_executor(request.user, notebook)
 
     # Handle static file charts
     if chart_type == "venn_diagram":
@@ -573,7 +575,10 @@ def render_dashboard_chart(request, slug):
         }, status=400)
 
     # Build code to execute based on chart_type
-    code = _build_chart_code(chart_type, params)
+    try:
+        code = _build_chart_code(chart_type, params)
+    except (TypeError, ValueError, OverflowError):
+        return JsonResponse({"error": "Invalid chart parameters"}, status=400)
 
     # Execute and capture output
     stdout, html, error, exec_time = executor.execute(code)
@@ -587,48 +592,82 @@ def render_dashboard_chart(request, slug):
     })
 
 
-def _build_chart_code(chart_type: str, params: dict) -> str:
-    """Build Python code to generate a specific chart type"""
-
-    if chart_type == "world_map":
-        colorscale = params.get("colorscale", "Viridis")
-        return f'tyk.plot_countries_map_global(colorscale="{colorscale}", height=350, method="modern")'
-
-    elif chart_type == "clusters_network":
-        min_weight = params.get("min_edge_weight", 0.0)
-        return f'tyk.plot_clusters_graph_interactive(min_edge_weight={min_weight}, mode="inline")'
-
-    elif chart_type == "subclusters_network":
-        top_id = params.get("cluster_id", "1")
-        min_weight = params.get("min_edge_weight", 0.0)
-        return f'tyk.plot_subclusters_graph_interactive("{top_id}", min_edge_weight={min_weight}, mode="inline")'
-
-    elif chart_type == "cooc_network":
-        _node_type_map = {
-            "Keywords": "K",
-            "Title Words": "TK",
-            "Subject Categories": "S",
-            "Subject Sub-Categories": "S2",
-            "Journal Sources": "J",
-            "Countries": "C",
-            "Institutions": "I",
-            "References": "R",
-            "Reference Sources": "RJ",
-            "Authors (Freq)": "A",
-        }
-        raw_node_type = params.get("node_type", "K")
-        node_type = _node_type_map.get(raw_node_type, raw_node_type)
-        max_nodes = params.get("max_nodes", 100)
-        return f'tyk.plot_cooc_network_interactive(node_type="{node_type}", max_nodes={max_nodes}, height_px=400, mode="inline")'
+# Display labels the dashboard may send for the co-occurrence node type
+_COOC_NODE_TYPES = {
+    "Keywords": "K",
+    "Title Words": "TK",
+    "Subject Categories": "S",
+    "Subject Sub-Categories": "S2",
+    "Journal Sources": "J",
+    "Countries": "C",
+    "Institutions": "I",
+    "References": "R",
+    "Reference Sources": "RJ",
+    "Authors (Freq)": "A",
+}
+
+
+def _finite_float(value) -> float:
+    """float(value), rejecting NaN and infinities (their repr is not valid code)"""
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"Not a finite number: {value!r}")
+    return number
+
+
+def _world_map_code(params: dict) -> str:
+    colorscale = str(params.get("colorscale", "Viridis"))
+    return f'tyk.plot_countries_map_global(colorscale={colorscale!r}, height=350, method="modern")'
+
 
-    elif chart_type == "cluster_stats":
-        cluster_id = params.get("cluster_id", "")
-        stuff_type = params.get("stuff_type", "K")
-        if cluster_id:
-            return f'tyk.describe_cluster_params("TOP", "{stuff_type}", cluster_top="{cluster_id}")'
-        return '# Select a cluster first'
+def _clusters_network_code(params: dict) -> str:
+    min_weight = _finite_float(params.get("min_edge_weight", 0.0))
+    return f'tyk.plot_clusters_graph_interactive(min_edge_weight={min_weight!r}, mode="inline")'
 
-    return "# Unknown chart type"
+
+def _subclusters_network_code(params: dict) -> str:
+    top_id = str(params.get("cluster_id", "1"))
+    min_weight = _finite_float(params.get("min_edge_weight", 0.0))
+    return f'tyk.plot_subclusters_graph_interactive({top_id!r}, min_edge_weight={min_weight!r}, mode="inline")'
+
+
+def _cooc_network_code(params: dict) -> str:
+    raw_node_type = str(params.get("node_type", "K"))
+    node_type = _COOC_NODE_TYPES.get(raw_node_type, raw_node_type)
+    max_nodes = int(_finite_float(params.get("max_nodes", 100)))
+    return f'tyk.plot_cooc_network_interactive(node_type={node_type!r}, max_nodes={max_nodes}, height_px=400, mode="inline")'
+
+
+def _cluster_stats_code(params: dict) -> str:
+    cluster_id = str(params.get("cluster_id", ""))
+    stuff_type = str(params.get("stuff_type", "K"))
+    if cluster_id:
+        return f'tyk.describe_cluster_params("TOP", {stuff_type!r}, cluster_top={cluster_id!r})'
+    return '# Select a cluster first'
+
+
+_CHART_CODE_BUILDERS = {
+    "world_map": _world_map_code,
+    "clusters_network": _clusters_network_code,
+    "subclusters_network": _subclusters_network_code,
+    "cooc_network": _cooc_network_code,
+    "cluster_stats": _cluster_stats_code,
+}
+
+
+def _build_chart_code(chart_type: str, params: dict) -> str:
+    """
+    Build Python code to generate a specific chart type.
+
+    Parameter values are interpolated as Python literals (repr() for
+    strings, float/int for numbers), so a quote in a request value cannot
+    break out of the generated call. Raises ValueError or TypeError for
+    values that are not finite numbers where one is expected.
+    """
+    builder = _CHART_CODE_BUILDERS.get(chart_type)
+    if builder is None:
+        return "# Unknown chart type"
+    return builder(params)
 
 
 @login_required
@@ -713,11 +752,10 @@ def notebook_dataset_info(request, slug):
     general_summary_html = None
     general_summary_preview_html = None
     if general_summary:
-        md_exts = ['fenced_code', 'tables', 'nl2br']
-        general_summary_html = markdown.markdown(general_summary, extensions=md_exts)
+        general_summary_html = render_markdown(general_summary)
         if len(general_summary) > 1000:
-            general_summary_preview_html = markdown.markdown(
-                general_summary[:1000].rstrip() + " …", extensions=md_exts
+            general_summary_preview_html = render_markdown(
+                general_summary[:1000].rstrip() + " …"
             )
 
     # --- Hierarchical PDF reports ---
@@ -1020,6 +1058,12 @@ def api_execute(request):
     """API endpoint for executing code"""
     try:
         data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({"error": "Expected a JSON object"}, status=400)
+
+    try:
         code = data.get("code", "")
         params = data.get("parameters", {})
         session_id = data.get("session_id")